@@ -1,5 +1,7 @@
 #!/usr/bin/python3
+import collections
 import curses
+import heapq
 import time
 import random
 
@@ -23,6 +25,8 @@ SHARK_ART = [
     ]
 ]
 
+SHARK_MAX_WIDTH = max(len(line) for art in SHARK_ART for line in art)
+
 OTHER_CREATURES = [
     [r"V=(° °)=V"],
     [
@@ -55,6 +59,10 @@ _  _  /  |  \  _   _   _
 """
 ]
 
+CASTLE_LINES = CASTLE_ART[0].strip().splitlines()
+CASTLE_HEIGHT = len(CASTLE_LINES)
+CASTLE_WIDTH = max(map(len, CASTLE_LINES))
+
 WATER_LINE = [
     "~~~-__~`~__-~~~~-~~~~-~~~~-~~~~-__~`~__-~~~~~-~~~~-~~",
     "^^^^ ^^^  ^^^   ^^^    ^^^^      ",
@@ -62,6 +70,32 @@ WATER_LINE = [
     "^^     ^^^^     ^^^    ^^^^^^  "
 ]
 
+WATER_LINE_LENGTHS = [len(line) for line in WATER_LINE]
+
+# Widths of multi-line art, keyed by id(art). Each entry also holds the art
+# itself so the id cannot be reused by another object while it is cached.
+_ART_WIDTHS = {
+    id(art): (art, max(map(len, art)))
+    for art in SHARK_ART + OTHER_CREATURES
+}
+
+
+def art_width(art):
+    """Returns the width of the widest line of art, computed once per art."""
+    entry = _ART_WIDTHS.get(id(art))
+    if entry is None:
+        entry = _ART_WIDTHS[id(art)] = (art, max(map(len, art)) if art else 0)
+    return entry[1]
+
+# Swimming directions: 1 is left to right, -1 is right to left.
+DIRECTIONS = (-1, 1)
+
+# Seconds between two frames of the main loop.
+FRAME_INTERVAL = 0.1
+
+# Per-tick chance of a fish or other creature blowing a bubble.
+BUBBLE_CHANCE = 0.02
+
 class Entity:
     """Base class for any object in the aquarium."""
     def __init__(self, x, y, art, direction=1, color=None):
@@ -69,8 +103,8 @@ class Entity:
         self.y = int(y)
         self.art = art
         self.direction = direction
-        self.color = color if color is not None else curses.color_pair(1)
-        self.width = max(len(line) for line in self.art) if self.art else 0
+        self.color = color if color is not None else Aquarium.default_color
+        self.width = len(art[0]) if len(art) == 1 else art_width(art)
         self.height = len(self.art)
         self.dead = False
 
@@ -90,9 +124,11 @@ class Entity:
 
     def collides_with(self, other):
         """Checks for collision with another entity."""
+        other_right = other.x + other.width
+        self_right = self.x + self.width
         return (
-            self.x < other.x + other.width and
-            self.x + self.width > other.x and
+            self.x < other_right and
+            self_right > other.x and
             self.y < other.y + other.height and
             self.y + self.height > other.y
         )
@@ -103,13 +139,30 @@ class Fish(Entity):
         super().__init__(x, y, art, direction, color=color)
         self.kind = 'fish'
 
+    def draw(self, screen):
+        """Draws the single-line art with one addstr call."""
+        try:
+            screen.addstr(self.y, self.x, self.art[0], self.color)
+        except curses.error:
+            pass
+
 class Bubble(Entity):
     """A bubble entity that moves upwards."""
+    # One shared single-line art per glyph, so spawning allocates no lists.
+    _GLYPHS = (["."], ["o"], ["O"])
+
     def __init__(self, x, y, color):
-        art = [random.choice([".", "o", "O"])]
+        art = random.choice(self._GLYPHS)
         super().__init__(x, y, art, direction=0, color=color)
         self.kind = 'bubble'
 
+    def draw(self, screen):
+        """Draws the single-line art with one addstr call."""
+        try:
+            screen.addstr(self.y, self.x, self.art[0], self.color)
+        except curses.error:
+            pass
+
     def move(self, max_width, max_height):
         """Overrides move to go upwards and die at the water line."""
         self.y -= 1
@@ -119,7 +172,7 @@ class Bubble(Entity):
 class Shark(Entity):
     """A shark entity that eats fish."""
     def __init__(self, max_width, max_height):
-        direction = random.choice([-1, 1])
+        direction = random.choice(DIRECTIONS)
         art_index = 0 if direction == 1 else 1
         art = SHARK_ART[art_index]
         y = random.randint(8, max_height - len(art) - 2)
@@ -132,7 +185,7 @@ class Shark(Entity):
 class OtherCreature(Entity):
     """A rare other creature entity."""
     def __init__(self, max_width, max_height):
-        direction = random.choice([-1, 1])
+        direction = random.choice(DIRECTIONS)
         art = OTHER_CREATURES[0]
         y = random.randint(5, max_height - len(art) - 5)
 
@@ -142,57 +195,153 @@ class OtherCreature(Entity):
         self.kind = 'other_creature'
 
 
+def remove_dead(entities):
+    """Drops dead entities in place by swapping each with the last one.
+
+    This does not keep the list order, which only matters for which of two
+    overlapping entities is drawn on top.
+    """
+    i = 0
+    while i < len(entities):
+        if entities[i].dead:
+            entities[i] = entities[-1]
+            entities.pop()
+        else:
+            i += 1
+
+
+def eat_fish(fish_list, sharks, cell_w, cell_h):
+    """Marks every fish that touches a shark as dead and returns those fish.
+
+    The sharks are bucketed into a uniform grid of cell_w x cell_h cells, so
+    each fish is only tested against the sharks in the cells it overlaps.
+    """
+    grid = collections.defaultdict(list)
+    for shark in sharks:
+        # Store the shark's box as plain ints so the narrow phase only
+        # does local compares instead of attribute lookups.
+        left, top = shark.x, shark.y
+        right, bottom = left + shark.width, top + shark.height
+        bounds = (left, right, top, bottom)
+        for cy in range(top // cell_h, (bottom - 1) // cell_h + 1):
+            for cx in range(left // cell_w, (right - 1) // cell_w + 1):
+                grid[(cx, cy)].append(bounds)
+
+    eaten = []
+    cells_get = grid.get
+    for fish in fish_list:
+        if fish.dead:
+            continue
+        left, top = fish.x, fish.y
+        right, bottom = left + fish.width, top + fish.height
+        for cy in range(top // cell_h, (bottom - 1) // cell_h + 1):
+            for cx in range(left // cell_w, (right - 1) // cell_w + 1):
+                for s_left, s_right, s_top, s_bottom in cells_get((cx, cy), ()):
+                    if left < s_right and right > s_left and top < s_bottom and bottom > s_top:
+                        fish.dead = True
+        if fish.dead:
+            eaten.append(fish)
+    return eaten
+
+
+class CellBuffer:
+    """An off-screen grid of (char, attr) cells with a curses-like addstr."""
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.cells = {}
+
+    def addstr(self, y, x, text, attr=0):
+        """Writes text starting at (y, x), clipping anything off-screen."""
+        if not 0 <= y < self.height:
+            return
+        cells = self.cells
+        for i, char in enumerate(text):
+            cell_x = x + i
+            if 0 <= cell_x < self.width:
+                cells[(y, cell_x)] = (char, attr)
+
+
 class Aquarium:
     """Manages the state and rendering of the aquarium."""
+    # Color for entities created without one; set to pair 1 once curses is up.
+    default_color = 0
+
     def __init__(self, screen):
         self.screen = screen
         self.max_y, self.max_x = self.screen.getmaxyx()
         self.entities = []
+        self.fish = []
+        self.sharks = []
+        self.bubbles = []
+        self.others = []
+        self._by_kind = {
+            'fish': self.fish,
+            'shark': self.sharks,
+            'bubble': self.bubbles,
+            'other_creature': self.others,
+        }
         self.running = True
         self.fish_colors = []
         self.castle_colors = []
         self.castle_color_index = 0
-        self.last_castle_color_change = time.time()
         self.water_colors = []
         self.water_color_index = 0
-        self.last_water_color_change = time.time()
         self.water_offset = 0
-        self.last_water_shift = time.time()
-
+        # Heap of (deadline, order, interval, callback) for the periodic events.
+        self._timers = []
+        # Cell size of the spatial hash used to find fish/shark collisions.
+        self._cell_w = max(SHARK_MAX_WIDTH, 8)
+        self._cell_h = 4
+        self._next_bubble_in = random.expovariate(BUBBLE_CHANCE)
+        # Set whenever something visible changes; draw() skips clean frames.
+        self._dirty = True
+        # What is currently on the terminal, as {(y, x): (char, attr)}.
+        self._prev_cells = {}
+        # Screen-wide water strings, cached per line and rotation offset.
+        self._water_tiles = [[None] * length for length in WATER_LINE_LENGTHS]
+
+    def resize(self):
+        """Picks up the new terminal size and forces a full repaint."""
+        self.max_y, self.max_x = self.screen.getmaxyx()
+        self._prev_cells = {}
+        self._water_tiles = [[None] * length for length in WATER_LINE_LENGTHS]
+        self._dirty = True
 
-    def add_water_lines(self):
+    def add_water_lines(self, canvas):
         """Draws the wavy, moving, color-shifting water lines at the top."""
         current_water_color = self.water_colors[self.water_color_index]
-        for i, line in enumerate(WATER_LINE):
-            offset = self.water_offset % len(line)
-            rotated_line = line[offset:] + line[:offset]
+        for i, tiles in enumerate(self._water_tiles):
+            offset = self.water_offset % WATER_LINE_LENGTHS[i]
+            tiled = tiles[offset]
+            if tiled is None:
+                line = WATER_LINE[i]
+                rotated_line = line[offset:] + line[:offset]
 
-            repeat = (self.max_x // len(rotated_line)) + 1
-            tiled = (rotated_line * repeat)[:self.max_x]
+                repeat = (self.max_x // WATER_LINE_LENGTHS[i]) + 1
+                tiled = tiles[offset] = (rotated_line * repeat)[:self.max_x]
 
-            self.screen.addstr(i + 1, 0, tiled, current_water_color)
+            canvas.addstr(i + 1, 0, tiled, current_water_color)
 
-    def add_castle(self):
+    def add_castle(self, canvas):
         """Draws the sand castle at the bottom right."""
-        castle_lines = CASTLE_ART[0].strip().splitlines()
-        castle_height = len(castle_lines)
-        castle_width = max(len(line) for line in castle_lines)
-
-        y_start = self.max_y - castle_height -1
-        x_start = self.max_x - castle_width - 2
+        y_start = self.max_y - CASTLE_HEIGHT -1
+        x_start = self.max_x - CASTLE_WIDTH - 2
 
         current_castle_color = self.castle_colors[self.castle_color_index]
 
-        for i, line in enumerate(castle_lines):
-            try:
-                self.screen.addstr(y_start + i, x_start, line, current_castle_color)
-            except curses.error:
-                pass
+        for i, line in enumerate(CASTLE_LINES):
+            canvas.addstr(y_start + i, x_start, line, current_castle_color)
+
+    def add_entity(self, entity):
+        """Adds an entity to the scene and to the list for its kind."""
+        self.entities.append(entity)
+        self._by_kind[entity.kind].append(entity)
 
     def spawn_fish(self):
         """Creates a new fish entity with a random color."""
         art_pair = random.choice(FISH_ART)
-        direction = random.choice([-1, 1])
+        direction = random.choice(DIRECTIONS)
         shape = art_pair[0] if direction == 1 else art_pair[1]
         lines = [shape]
 
@@ -201,52 +350,157 @@ class Aquarium:
 
         random_color = random.choice(self.fish_colors)
 
-        self.entities.append(Fish(x, y, lines, direction, random_color))
+        self.add_entity(Fish(x, y, lines, direction, random_color))
 
     def maybe_spawn_shark(self):
         """Has a small chance of spawning a shark."""
         if random.random() < 0.05:
-            self.entities.append(Shark(self.max_x, self.max_y))
+            self.add_entity(Shark(self.max_x, self.max_y))
 
     def maybe_spawn_other_creature(self):
         """Has a very small chance of spawning a other creature."""
         if random.random() < 0.09:
-            self.entities.append(OtherCreature(self.max_x, self.max_y))
+            self.add_entity(OtherCreature(self.max_x, self.max_y))
+
+    def spawn_rare_creatures(self):
+        """Rolls for a shark and for an other creature."""
+        self.maybe_spawn_shark()
+        self.maybe_spawn_other_creature()
+
+    def cycle_castle_color(self):
+        """Moves the castle on to its next color."""
+        self.castle_color_index = (self.castle_color_index + 1) % len(self.castle_colors)
+        self._dirty = True
+
+    def cycle_water_color(self):
+        """Moves the water lines on to their next color."""
+        self.water_color_index = (self.water_color_index + 1) % len(self.water_colors)
+        self._dirty = True
+
+    def shift_water(self):
+        """Scrolls the water lines by one column."""
+        self.water_offset += 1
+        self._dirty = True
+
+    def start_timers(self, now):
+        """Schedules the periodic events, each first due one interval from now."""
+        self._timers = [
+            (now + interval, order, interval, callback)
+            for order, (interval, callback) in enumerate([
+                (1.5, self.spawn_fish),
+                (7, self.spawn_rare_creatures),
+                (0.5, self.cycle_castle_color),
+                (1.0, self.cycle_water_color),
+                (0.15, self.shift_water),
+            ])
+        ]
+        heapq.heapify(self._timers)
+
+    def fire_timers(self, now):
+        """Runs every periodic event that is due and schedules its next run.
+
+        The order is unique per timer, so entries with equal deadlines never
+        fall through to comparing the callbacks.
+        """
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            _, order, interval, callback = timers[0]
+            callback()
+            heapq.heapreplace(timers, (now + interval, order, interval, callback))
 
     def update(self):
         """Updates the state of all entities in the aquarium."""
         new_entities = []
-        sharks = [e for e in self.entities if e.kind == 'shark']
 
+        # Entities that died this tick; the lists are only compacted if any did.
+        dead = []
+        max_x, max_y = self.max_x, self.max_y
         for entity in self.entities:
-            entity.move(self.max_x, self.max_y)
-
-        for entity in self.entities:
-            if entity.kind == 'fish' or entity.kind == 'other_creature':
-                if random.random() < 0.02:
-                    bubble_x = entity.x + random.randint(0, entity.width - 1)
-                    bubble_color = self.water_colors[self.water_color_index]
-                    new_entities.append(Bubble(bubble_x, entity.y, bubble_color))
-
-            if entity.kind == 'fish':
-                for shark in sharks:
-                    if not entity.dead and shark.collides_with(entity):
-                        entity.dead = True
-                        break
-
-        self.entities.extend(new_entities)
-        self.entities = [e for e in self.entities if not e.dead]
-
+            entity.move(max_x, max_y)
+            if entity.dead:
+                dead.append(entity)
+        if self.entities:
+            self._dirty = True
+
+        # Each fish or other creature blows a bubble with a small chance per
+        # tick. Rather than rolling for every one of them, count down the
+        # exponentially distributed number of entity-ticks to the next bubble.
+        fish_list, others = self.fish, self.others
+        emitters = len(fish_list) + len(others)
+        if emitters:
+            bubble_color = self.water_colors[self.water_color_index]
+            self._next_bubble_in -= emitters
+            while self._next_bubble_in <= 0:
+                i = random.randrange(emitters)
+                if i < len(fish_list):
+                    entity = fish_list[i]
+                else:
+                    entity = others[i - len(fish_list)]
+                bubble_x = entity.x + random.randint(0, entity.width - 1)
+                new_entities.append(Bubble(bubble_x, entity.y, bubble_color))
+                self._next_bubble_in += random.expovariate(BUBBLE_CHANCE)
+
+        # Sharks are rare, so most ticks skip the collision sweep entirely.
+        if self.sharks:
+            dead.extend(eat_fish(self.fish, self.sharks, self._cell_w, self._cell_h))
+
+        if dead:
+            remove_dead(self.entities)
+            for kind in {entity.kind for entity in dead}:
+                remove_dead(self._by_kind[kind])
+        for bubble in new_entities:
+            self.add_entity(bubble)
 
     def draw(self):
-        """Clears the screen and draws all elements."""
-        self.screen.clear()
-        self.add_water_lines()
-        self.add_castle()
+        """Renders the scene off-screen and writes only the cells that changed."""
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        frame = CellBuffer(self.max_y, self.max_x)
+        self.add_water_lines(frame)
+        self.add_castle(frame)
         for entity in self.entities:
-            entity.draw(self.screen)
+            entity.draw(frame)
+
+        cells = frame.cells
+        prev_cells = self._prev_cells
+        if not prev_cells:
+            self.screen.erase()
+        changed = {pos: cell for pos, cell in cells.items() if prev_cells.get(pos) != cell}
+        for pos in prev_cells.keys() - cells.keys():
+            changed[pos] = (" ", 0)
+        self._write_runs(changed)
+        self._prev_cells = cells
         self.screen.refresh()
 
+    def _write_runs(self, changed):
+        """Writes the changed cells, one addstr per run of adjacent cells.
+
+        Cells on the same row that follow each other and share an attribute
+        are joined into a single string.
+        """
+        run_y = run_x = run_attr = None
+        run_chars = []
+        for y, x in sorted(changed):
+            char, attr = changed[(y, x)]
+            if y == run_y and x == run_x + len(run_chars) and attr == run_attr:
+                run_chars.append(char)
+                continue
+            if run_chars:
+                self._put_run(run_y, run_x, "".join(run_chars), run_attr)
+            run_y, run_x, run_attr, run_chars = y, x, attr, [char]
+        if run_chars:
+            self._put_run(run_y, run_x, "".join(run_chars), run_attr)
+
+    def _put_run(self, y, x, text, attr):
+        """Writes a run of cells to the terminal."""
+        try:
+            self.screen.addstr(y, x, text, attr)
+        except curses.error:
+            # Writing the bottom-right cell moves the cursor off-screen.
+            pass
+
     def run(self):
         """Main loop for the application."""
         curses.curs_set(0)
@@ -264,6 +518,7 @@ class Aquarium:
         curses.init_pair(8, curses.COLOR_YELLOW, -1)
         curses.init_pair(9, curses.COLOR_RED, -1)
         curses.init_pair(10, curses.COLOR_MAGENTA, -1)
+        Aquarium.default_color = curses.color_pair(1)
 
         self.fish_colors = [
             curses.color_pair(1),
@@ -281,42 +536,36 @@ class Aquarium:
             curses.color_pair(2),
         ]
 
-        last_fish_spawn = time.time()
-        last_rare_spawn_check = time.time()
+        self.start_timers(time.monotonic())
+        next_frame = time.monotonic() + FRAME_INTERVAL
 
         while self.running:
             try:
                 key = self.screen.getch()
+                if key == curses.KEY_RESIZE:
+                    self.resize()
+                    continue
                 if key != -1:
                     self.running = False
                     continue
 
-                now = time.time()
-
-                if now - last_fish_spawn > 1.5:
-                    self.spawn_fish()
-                    last_fish_spawn = now
+                now = time.monotonic()
 
-                if now - last_rare_spawn_check > 7:
-                    self.maybe_spawn_shark()
-                    self.maybe_spawn_other_creature()
-                    last_rare_spawn_check = now
-
-                if now - self.last_castle_color_change > 0.5:
-                    self.castle_color_index = (self.castle_color_index + 1) % len(self.castle_colors)
-                    self.last_castle_color_change = now
-
-                if now - self.last_water_color_change > 1.0:
-                    self.water_color_index = (self.water_color_index + 1) % len(self.water_colors)
-                    self.last_water_color_change = now
-
-                if now - self.last_water_shift > 0.15:
-                    self.water_offset += 1
-                    self.last_water_shift = now
+                self.fire_timers(now)
 
                 self.update()
                 self.draw()
-                time.sleep(0.1)
+
+                # Sleep until the next frame is due rather than for a fixed
+                # time, so the work done this frame does not add up to drift.
+                delay = next_frame - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_frame += FRAME_INTERVAL
+                if delay < -FRAME_INTERVAL:
+                    # Too far behind: start over instead of rushing the
+                    # missed frames.
+                    next_frame = time.monotonic() + FRAME_INTERVAL
             except (curses.error, KeyboardInterrupt):
                 self.running = False
 
@@ -0,0 +1,78 @@
+# tests/test_draw.py
+
+import os
+import sys
+
+# Add the project root (the directory containing pyaquarium.py) to sys.path
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from pyaquarium import Aquarium, CellBuffer, Fish
+
+
+class RecordingScreen:
+    """Stand-in for a curses window that records every write."""
+    def __init__(self):
+        self.writes = []
+
+    def getmaxyx(self):
+        return 30, 80
+
+    def addstr(self, y, x, text, attr=0):
+        self.writes.append((y, x, text, attr))
+
+    def erase(self):
+        self.writes.clear()
+
+    def refresh(self):
+        pass
+
+
+def make_aquarium():
+    aquarium = Aquarium(RecordingScreen())
+    aquarium.water_colors = [1]
+    aquarium.castle_colors = [2]
+    return aquarium
+
+
+def test_cell_buffer_clips_to_screen():
+    buffer = CellBuffer(2, 4)
+    buffer.addstr(0, -2, "abcdef", 7)
+    buffer.addstr(5, 0, "zz", 7)
+
+    assert buffer.cells == {
+        (0, 0): ("c", 7),
+        (0, 1): ("d", 7),
+        (0, 2): ("e", 7),
+        (0, 3): ("f", 7),
+    }
+
+
+def test_unchanged_frame_writes_nothing():
+    aquarium = make_aquarium()
+    aquarium.draw()
+    assert aquarium.screen.writes
+
+    aquarium.screen.writes.clear()
+    aquarium._dirty = True
+    aquarium.draw()
+
+    assert not aquarium.screen.writes
+
+
+def test_only_changed_cells_are_written():
+    aquarium = make_aquarium()
+    fish = Fish(10, 15, ["><>"], 1, 3)
+    aquarium.add_entity(fish)
+    aquarium.draw()
+
+    aquarium.screen.writes.clear()
+    fish.x += 1
+    aquarium._dirty = True
+    aquarium.draw()
+
+    assert aquarium.screen.writes == [
+        (15, 10, " ", 0),
+        (15, 11, "><>", 3),
+    ]
@@ -0,0 +1,58 @@
+# tests/test_shark_collision.py
+
+import os
+import sys
+
+# Add the project root (the directory containing pyaquarium.py) to sys.path
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from pyaquarium import Aquarium, Entity, Fish, SHARK_ART
+
+
+class FakeScreen:
+    """Minimal stand-in for a curses window."""
+    def getmaxyx(self):
+        return 40, 120
+
+
+def make_shark(x, y):
+    shark = Entity(x=x, y=y, art=SHARK_ART[0], direction=0, color=0)
+    shark.kind = 'shark'
+    return shark
+
+
+def make_aquarium():
+    aquarium = Aquarium(FakeScreen())
+    aquarium.water_colors = [0]
+    return aquarium
+
+
+def test_fish_touching_shark_is_eaten():
+    aquarium = make_aquarium()
+    shark = make_shark(40, 20)
+    fish = Fish(45, 21, ["><>"], 1, 0)
+    aquarium.add_entity(shark)
+    aquarium.add_entity(fish)
+
+    aquarium.update()
+
+    assert fish.dead
+    assert fish not in aquarium.entities
+    assert fish not in aquarium.fish
+    assert shark in aquarium.entities
+
+
+def test_fish_away_from_shark_survives():
+    aquarium = make_aquarium()
+    shark = make_shark(40, 20)
+    near_cell = Fish(40, 25, ["><>"], 1, 0)
+    far_away = Fish(5, 5, ["><>"], 1, 0)
+    for entity in (shark, near_cell, far_away):
+        aquarium.add_entity(entity)
+
+    aquarium.update()
+
+    assert not near_cell.dead
+    assert not far_away.dead
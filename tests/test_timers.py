@@ -0,0 +1,37 @@
+# tests/test_timers.py
+
+import os
+import sys
+
+# Add the project root (the directory containing pyaquarium.py) to sys.path
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from pyaquarium import Aquarium
+
+
+class FakeScreen:
+    """Minimal stand-in for a curses window."""
+    def getmaxyx(self):
+        return 40, 120
+
+
+def test_only_due_timers_fire():
+    aquarium = Aquarium(FakeScreen())
+    aquarium.castle_colors = [0, 1, 2]
+    aquarium.water_colors = [0, 1]
+    aquarium.start_timers(0.0)
+
+    aquarium.fire_timers(0.1)
+    assert aquarium.water_offset == 0
+    assert aquarium.castle_color_index == 0
+
+    aquarium.fire_timers(0.2)
+    assert aquarium.water_offset == 1
+    assert aquarium.castle_color_index == 0
+
+    aquarium.fire_timers(0.6)
+    assert aquarium.water_offset == 2
+    assert aquarium.castle_color_index == 1
+    assert aquarium.water_color_index == 0